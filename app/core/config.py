@@ -66,6 +66,13 @@ class Settings(BaseSettings):
         validation_alias=AliasChoices("access_token_expire_minutes", "ACCESS_TOKEN_EXPIRE_MINUTES")
     )
 
+    # Password hashing
+
+    bcrypt_rounds: int = Field(
+        default=12,
+        validation_alias=AliasChoices("bcrypt_rounds", "BCRYPT_ROUNDS")
+    )
+
     # Environment
 
     environment: str = Field(
@@ -32,8 +32,9 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
 	"""Hash a password."""
 	# Convert password to bytes, hash it, and return as string
+	# Cost factor comes from settings (BCRYPT_ROUNDS; tests/conftest.py sets 4)
 	password_bytes = password.encode('utf-8')
-	hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
+	hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=_get_settings().bcrypt_rounds))
 	return hashed.decode('utf-8')
 
 
@@ -51,6 +52,11 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 	return encoded_jwt
 
 
+def mint_token(account_id, username: str) -> str:
+	"""Create an access token with the claims issued at login."""
+	return create_access_token(data={"sub": str(account_id), "username": username})
+
+
 def decode_access_token(token: str):
     """
     Decode a JWT token and return the payload.
@@ -1,8 +1,9 @@
 import base64
+import uuid
 import requests
 import httpx
-from typing import List
-from fastapi import APIRouter, HTTPException, Depends, status
+from typing import Any, Dict, List
+from fastapi import APIRouter, HTTPException, Depends, Query, status
 from fastapi.responses import Response
 from pydantic import BaseModel
 
@@ -16,6 +17,8 @@ router = APIRouter(prefix="/files", tags=["files"])
 logger = logging.getLogger(__name__)
 settings = get_settings()
 MASTER_NODE_URL = settings.master_node_url
+# Upper bound on ids accepted by GET /files/batch
+MAX_BATCH_FILES = 100
 
 class FileInfo(BaseModel):
     file_id: str
@@ -29,6 +32,13 @@ class FileInfo(BaseModel):
 class FileListResponse(BaseModel):
     files: List[FileInfo]
 
+class FileDetail(FileInfo):
+    version_id: str
+    fragments: List[Dict[str, Any]]
+
+class FileBatchResponse(BaseModel):
+    files: List[FileDetail]
+
 def get_current_account_from_master(token: str):
     """Get account info from master node API."""
     try:
@@ -265,4 +275,88 @@ async def get_file_info(file_id: str, current_account = Depends(get_current_acco
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Master node unavailable: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.get("/batch", response_model=FileBatchResponse)
+async def get_files_batch(
+    ids: str = Query(..., description="Comma-separated file IDs"),
+    current_account = Depends(get_current_account)
+):
+    """Get file information and fragment locations (latest version) for several files in one request."""
+    try:
+        file_ids = [file_id.strip() for file_id in ids.split(",") if file_id.strip()]
+        if not file_ids:
+            raise HTTPException(status_code=400, detail="At least one file ID is required")
+        if len(file_ids) > MAX_BATCH_FILES:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_FILES} file IDs are allowed per request")
+        try:
+            file_ids = [str(uuid.UUID(file_id)) for file_id in file_ids]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid file ID format")
+        
+        account_id = current_account["account_id"]
+        
+        # One query for all files and one for all of their fragments,
+        # instead of a /files/info + /fragments round trip per file
+        async with httpx.AsyncClient() as client:
+            # Latest version of each file only
+            files_response = await client.post(f"{MASTER_NODE_URL}/query", json={
+                "sql": """
+                    SELECT * FROM (
+                        SELECT DISTINCT ON (fo.file_id)
+                               fo.file_id, fo.account_id, fo.file_name, fo.file_size, fo.logical_path,
+                               fo.uploaded_at, fv.version_id, fv.erasure_id, fv.content_hash
+                        FROM file_objects fo
+                        JOIN file_versions fv ON fo.file_id = fv.file_id
+                        WHERE fo.file_id = ANY($1::uuid[]) AND fo.account_id = $2
+                        ORDER BY fo.file_id, fv.uploaded_at DESC
+                    ) latest
+                    ORDER BY uploaded_at DESC
+                """,
+                "params": [file_ids, account_id]
+            })
+            if files_response.status_code != 200 or not files_response.json().get("success"):
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Failed to retrieve files: {files_response.text}"
+                )
+            file_rows = files_response.json()["data"]
+            if not file_rows:
+                return {"files": []}
+            
+            # Version ids come from the account-filtered query above
+            version_ids = [file_info["version_id"] for file_info in file_rows]
+            fragments_response = await client.post(f"{MASTER_NODE_URL}/query", json={
+                "sql": """
+                    SELECT fs.version_id, ff.fragment_id, ff.segment_id, ff.num_fragment, ff.bytes,
+                           ff.content_hash, fl.node_id, fl.fragment_address, n.api_endpoint, n.hostname
+                    FROM file_segments fs
+                    JOIN file_fragments ff ON fs.segment_id = ff.segment_id
+                    LEFT JOIN fragment_location fl ON ff.fragment_id = fl.fragment_id
+                    LEFT JOIN node n ON fl.node_id = n.node_id
+                    WHERE fs.version_id = ANY($1::uuid[])
+                    ORDER BY fs.version_id, ff.num_fragment
+                """,
+                "params": [version_ids]
+            })
+            if fragments_response.status_code != 200 or not fragments_response.json().get("success"):
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Failed to retrieve fragments: {fragments_response.text}"
+                )
+        
+        fragments_by_version: Dict[str, List[Dict[str, Any]]] = {}
+        for fragment in fragments_response.json()["data"]:
+            fragments_by_version.setdefault(fragment.pop("version_id"), []).append(fragment)
+        
+        files = [
+            {**file_info, "fragments": fragments_by_version.get(file_info["version_id"], [])}
+            for file_info in file_rows
+        ]
+        return {"files": files}
+    
+    except httpx.RequestError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Master node unavailable: {str(e)}"
+        )
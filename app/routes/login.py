@@ -6,7 +6,7 @@ import traceback
 import logging
 
 from app.master_node_db import MasterNodeDB, get_master_db
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import verify_password, get_password_hash, mint_token
 import uuid
 
 logger = logging.getLogger(__name__)
@@ -125,9 +125,7 @@ def login(
 			)
 		
 		# Create access token
-		access_token = create_access_token(
-			data={"sub": str(account_id_uuid), "username": account["username"]}
-		)
+		access_token = mint_token(account_id_uuid, account["username"])
 		
 		# Log login activity via Master Node
 		try:
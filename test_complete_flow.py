@@ -4,8 +4,11 @@ Complete End-to-End Test Script for Distributed File Storage System
 Tests: Authentication, Upload, Database Metadata, Download, and Cleanup
 
 Usage: python test_complete_flow.py
+       pytest -m integration test_complete_flow.py
 """
+import asyncio
 import requests
+import httpx
 import base64
 import json
 import hashlib
@@ -14,6 +17,7 @@ import os
 import sys
 from typing import Dict, Optional
 import psycopg2
+import pytest
 from psycopg2.extras import RealDictCursor
 
 # Configuration
@@ -27,6 +31,19 @@ DB_CONFIG = {
     'password': 'password'
 }
 
+# Needs the docker-compose stack; excluded from default pytest runs (see pytest.ini)
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture(scope="session")
+def live_services():
+    """Skip the module once if the backend or master node is not reachable."""
+    for url in (f"{BASE_URL}/auth/me", f"{MASTER_NODE_URL}/health"):
+        try:
+            requests.get(url, timeout=5)
+        except requests.RequestException:
+            pytest.skip(f"{url} is not reachable; start docker-compose first", allow_module_level=True)
+
 class FileStorageTestSuite:
     def __init__(self):
         self.access_token = None
@@ -36,6 +53,9 @@ class FileStorageTestSuite:
         self.test_file_data = None
         self.test_file_hash = None
         self.erasure_profiles = ["LOW", "MEDIUM", "HIGH"]
+        # One pooled session for the whole run so every request reuses the
+        # same keep-alive connections instead of a fresh TCP handshake.
+        self.session = requests.Session()
         
         # Create test file data
         self.create_test_file()
@@ -69,13 +89,14 @@ End of test file.
         }
         
         try:
-            response = requests.post(f"{BASE_URL}/auth/login", json=login_data)
+            response = self.session.post(f"{BASE_URL}/auth/login", json=login_data)
             
             if response.status_code == 200:
                 auth_result = response.json()
                 self.access_token = auth_result["access_token"]
                 self.account_id = auth_result["account_id"]
                 self.username = auth_result["username"]
+                self.session.headers.update({"Authorization": f"Bearer {self.access_token}"})
                 
                 print(f"✅ Login successful!")
                 print(f"   Username: {self.username}")
@@ -99,37 +120,49 @@ End of test file.
             print("❌ No access token available")
             return False
         
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
-        
         profile_info = {
             "LOW": {"k": 4, "m": 2, "description": "4+2=6 fragments"},
             "MEDIUM": {"k": 6, "m": 3, "description": "6+3=9 fragments"},
             "HIGH": {"k": 8, "m": 4, "description": "8+4=12 fragments"}
         }
         
+        # Prepare upload data for every profile up front. All profiles upload
+        # the same bytes, so encode them once rather than once per profile.
+        file_b64 = base64.b64encode(self.test_file_data).decode('utf-8')
+        payloads = []
+        for profile in self.erasure_profiles:
+            test_filename = f"{self.test_filename_base}_{profile.lower()}.txt"
+            payloads.append({
+                "filename": test_filename,
+                "data": file_b64,
+                "content_type": "text/plain",
+                "erasure_id": profile
+            })
+        
+        async def _upload_all():
+            # The uploads are independent, so dispatch them concurrently and
+            # wait for the slowest one instead of the sum of all of them.
+            headers = {"Authorization": f"Bearer {self.access_token}"}
+            async with httpx.AsyncClient(base_url=BASE_URL, headers=headers, timeout=60) as ac:
+                return await asyncio.gather(
+                    *[ac.post("/files/upload", json=payload) for payload in payloads],
+                    return_exceptions=True
+                )
+        
+        responses = asyncio.run(_upload_all())
+        
         success_count = 0
         
-        for profile in self.erasure_profiles:
+        for profile, upload_data, response in zip(self.erasure_profiles, payloads, responses):
+            test_filename = upload_data["filename"]
+            
+            print(f"\n📋 Testing {profile} profile:")
+            print(f"   File: {test_filename}")
+            print(f"   Profile: {profile} ({profile_info[profile]['description']})")
+            
             try:
-                # Prepare upload data for this profile
-                test_filename = f"{self.test_filename_base}_{profile.lower()}.txt"
-                file_b64 = base64.b64encode(self.test_file_data).decode('utf-8')
-                
-                upload_data = {
-                    "filename": test_filename,
-                    "data": file_b64,
-                    "content_type": "text/plain",
-                    "erasure_id": profile
-                }
-                
-                print(f"\n📋 Testing {profile} profile:")
-                print(f"   File: {test_filename}")
-                print(f"   Profile: {profile} ({profile_info[profile]['description']})")
-                
-                response = requests.post(f"{BASE_URL}/files/upload", json=upload_data, headers=headers)
+                if isinstance(response, Exception):
+                    raise response
                 
                 if response.status_code == 201:
                     upload_result = response.json()
@@ -177,7 +210,7 @@ End of test file.
                 print(f"   File ID: {file_id}")
                 
                 # Query master node for file metadata
-                response = requests.get(f"{MASTER_NODE_URL}/files/info/{file_id}")
+                response = self.session.get(f"{MASTER_NODE_URL}/files/info/{file_id}")
                 
                 if response.status_code == 200:
                     file_metadata = response.json()["file"]
@@ -197,7 +230,7 @@ End of test file.
                         continue
                     
                     # Query fragments for this file
-                    fragments_response = requests.get(f"{MASTER_NODE_URL}/fragments/{file_id}")
+                    fragments_response = self.session.get(f"{MASTER_NODE_URL}/fragments/{file_id}")
                     if fragments_response.status_code == 200:
                         fragments = fragments_response.json()
                         
@@ -234,10 +267,6 @@ End of test file.
             print("❌ Missing access token or uploaded files")
             return False
         
-        headers = {
-            "Authorization": f"Bearer {self.access_token}"
-        }
-        
         success_count = 0
         
         for profile, file_info in self.uploaded_files.items():
@@ -249,7 +278,7 @@ End of test file.
                 print(f"   File: {filename}")
                 print(f"   File ID: {file_id}")
                 
-                response = requests.get(f"{BASE_URL}/files/download/{file_id}", headers=headers)
+                response = self.session.get(f"{BASE_URL}/files/download/{file_id}")
                 
                 if response.status_code == 200:
                     # Check if response is raw file data or JSON
@@ -348,10 +377,6 @@ End of test file.
             print("❌ Missing access token or uploaded files")
             return False
         
-        headers = {
-            "Authorization": f"Bearer {self.access_token}"
-        }
-        
         success_count = 0
         
         for profile, file_info in self.uploaded_files.items():
@@ -362,7 +387,7 @@ End of test file.
                 print(f"\n📋 Testing file info for {profile} profile:")
                 print(f"   File: {filename}")
                 
-                response = requests.get(f"{BASE_URL}/files/info/{file_id}", headers=headers)
+                response = self.session.get(f"{BASE_URL}/files/info/{file_id}")
                 
                 if response.status_code == 200:
                     info_result = response.json()
@@ -456,6 +481,10 @@ End of test file.
         
         return passed == total
 
+def test_complete_flow(live_services):
+    """Run the end-to-end suite under pytest against the live services."""
+    assert FileStorageTestSuite().run_all_tests()
+
 def main():
     """Main function to run the test suite."""
     print("🔧 Distributed File Storage System - End-to-End Test")
@@ -55,60 +55,64 @@ def main():
         print("📁 Recent Files and Fragment Distribution:")
         print("=" * 50)
         files_response = requests.get(
-            'http://localhost:8004/files',
+            'http://localhost:8004/files/list',
             headers=headers
         )
         
         if files_response.status_code == 200:
-            files_data = files_response.json()
+            files_data = files_response.json()['files']
             
-            # Show last 5 files (including our test uploads)
-            recent_files = files_data[-5:] if len(files_data) >= 5 else files_data
+            # /files/list is ordered by uploaded_at DESC, so the 5 most recent are at the front
+            recent_files = files_data[:5]
+            
+            # Fetch details for all recent files in one request instead of one per file
+            ids = ",".join(f['file_id'] for f in recent_files if f.get('file_id'))
+            batch_response = requests.get(
+                'http://localhost:8004/files/batch',
+                params={'ids': ids},
+                headers=headers
+            )
+            if batch_response.status_code == 200:
+                file_details = {f['file_id']: f for f in batch_response.json().get('files', [])}
+            else:
+                file_details = None
             
             for file_info in recent_files:
-                filename = file_info.get('filename', 'Unknown')
+                file_name = file_info.get('file_name', 'Unknown')
                 file_id = file_info.get('file_id', 'Unknown')
                 file_size = file_info.get('file_size', 0)
-                erasure_profile = file_info.get('erasure_profile', 'Unknown')
-                created_at = file_info.get('created_at', 'Unknown')
+                erasure_id = file_info.get('erasure_id', 'Unknown')
+                uploaded_at = file_info.get('uploaded_at', 'Unknown')
                 
-                print(f"\n📄 File: {filename}")
+                print(f"\n📄 File: {file_name}")
                 print(f"   ID: {file_id}")
                 print(f"   Size: {file_size:,} bytes")
-                print(f"   Erasure Profile: {erasure_profile}")
-                print(f"   Created: {created_at}")
-                
-                # Get detailed fragment information
-                file_detail_response = requests.get(
-                    f'http://localhost:8004/files/{file_id}',
-                    headers=headers
-                )
+                print(f"   Erasure Profile: {erasure_id}")
+                print(f"   Uploaded: {uploaded_at}")
                 
-                if file_detail_response.status_code == 200:
-                    file_detail = file_detail_response.json()
+                if file_details is not None:
+                    file_detail = file_details.get(file_id, {})
                     fragments = file_detail.get('fragments', [])
-                    versions = file_detail.get('versions', [])
                     
                     print(f"   Total Fragments: {len(fragments)}")
                     
-                    if versions:
-                        latest_version = versions[-1]  # Get latest version
-                        print(f"   Version: {latest_version.get('version_id', 'Unknown')}")
-                        print(f"   Status: {latest_version.get('status', 'Unknown')}")
+                    if file_detail.get('version_id'):
+                        print(f"   Version: {file_detail['version_id']}")
                     
                     print("   Fragment Distribution:")
                     for j, fragment in enumerate(fragments):
-                        storage_url = fragment.get('storage_node_url', 'Unknown')
-                        fragment_index = fragment.get('fragment_index', 'Unknown')
-                        fragment_size = fragment.get('fragment_size', 0)
-                        checksum = fragment.get('checksum', 'Unknown')[:8] + '...'
+                        storage_url = fragment.get('api_endpoint') or 'Unknown'
+                        fragment_index = fragment.get('num_fragment', 'Unknown')
+                        # BIGINT columns come back from the master node as strings
+                        fragment_size = int(fragment.get('bytes') or 0)
+                        checksum = (fragment.get('content_hash') or 'Unknown')[:8] + '...'
                         
                         print(f"     Fragment {j+1}: {storage_url}")
                         print(f"       Index: {fragment_index}")
                         print(f"       Size: {fragment_size:,} bytes")
                         print(f"       Checksum: {checksum}")
                 else:
-                    print(f"   ❌ Could not get fragment details (Status: {file_detail_response.status_code})")
+                    print(f"   ❌ Could not get fragment details (Status: {batch_response.status_code})")
         else:
             print(f"❌ Could not get files list (Status: {files_response.status_code})")
             
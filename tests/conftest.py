@@ -15,24 +15,34 @@ warnings.filterwarnings(
 )
 
 import os
+import re
+import traceback
 import uuid
+from uuid import UUID
 import pytest
 
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from fastapi.testclient import TestClient
 
 from datetime import datetime, timedelta, timezone
+
+# Force test mode before any app module reads it
+os.environ["TESTING"] = "1"
+# Minimum bcrypt cost: tests don't need production-strength hashes
+os.environ["BCRYPT_ROUNDS"] = "4"
+
 from app.core.config import get_settings
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash, mint_token
 from app.models import Base, Account, FreeAccount, PaidAccount, FileObject, PasswordResetToken, ActivityLog
-from app.main import app
+from app.main import app as fastapi_app
 from app.db.session import get_db, get_master_node_db
+from app.master_node_db import get_master_db
 
 # -----------------------------
-# Force test mode and load settings
+# Load test settings
 # -----------------------------
-os.environ["TESTING"] = "1"
 settings = get_settings(testing=True)
 
 # -----------------------------
@@ -65,114 +75,192 @@ if is_prod_db or not is_test_db:
 
 print(f"[TEST CONFIG] ✓ Safety check passed - Using test database: {test_db_url}")
 
+# -----------------------------
+# Per-worker database for pytest-xdist
+# -----------------------------
+# Under `pytest -n ...` each worker gets its own database (e.g. test_fyp_gw0)
+# so parallel workers never drop or recreate each other's tables.
+# Plain `pytest` runs keep using the configured test database.
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+_base_db_url = make_url(settings.database_url)
+if XDIST_WORKER:
+    worker_db_url = _base_db_url.set(database=f"{_base_db_url.database}_{XDIST_WORKER}")
+else:
+    worker_db_url = _base_db_url
+
 # -----------------------------
 # Database engine & session
 # -----------------------------
-engine = create_engine(settings.database_url)
+engine = create_engine(worker_db_url)
 TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
+# -----------------------------
+# Seed constants
+# -----------------------------
+# Fixed ids and a frozen clock keep seed data deterministic across tests
+_ALICE_ID = uuid.UUID("123e4567-e89b-12d3-a456-426614174000")
+_BOB_ID = uuid.UUID("123e4567-e89b-12d3-a456-426614174001")
+_ADMIN_ID = uuid.UUID("123e4567-e89b-12d3-a456-426614174002")
+# One FREE user per update_user test, so profile/password changes never
+# touch the alice account the other tests rely on
+_PROFILE_USER_IDS = {
+    "alice_profile_username": uuid.UUID("123e4567-e89b-12d3-a456-426614174010"),
+    "alice_profile_email": uuid.UUID("123e4567-e89b-12d3-a456-426614174011"),
+    "alice_profile_both": uuid.UUID("123e4567-e89b-12d3-a456-426614174012"),
+    "alice_password": uuid.UUID("123e4567-e89b-12d3-a456-426614174013"),
+}
+_SEED_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+_SEED_RENEWAL = _SEED_NOW + timedelta(days=30)
+
 # -----------------------------
 # Fixtures
 # -----------------------------
 
+@pytest.fixture(scope="session")
+def _worker_database():
+    """
+    Create this xdist worker's database and drop it when the worker finishes.
+    No-op when tests are not running under pytest-xdist.
+    """
+    if not XDIST_WORKER:
+        yield
+        return
+
+    # CREATE/DROP DATABASE cannot run inside a transaction block
+    admin_engine = create_engine(_base_db_url.set(database="postgres"), isolation_level="AUTOCOMMIT")
+    db_name = worker_db_url.database
+    with admin_engine.connect() as conn:
+        conn.execute(text(f'DROP DATABASE IF EXISTS "{db_name}" WITH (FORCE)'))
+        conn.execute(text(f'CREATE DATABASE "{db_name}"'))
+    try:
+        yield
+    finally:
+        engine.dispose()
+        with admin_engine.connect() as conn:
+            conn.execute(text(f'DROP DATABASE IF EXISTS "{db_name}" WITH (FORCE)'))
+        admin_engine.dispose()
+
+
 @pytest.fixture(scope="session", autouse=True)
-def setup_test_db():
+def setup_test_db(_worker_database):
     """
     Drop and recreate all tables once per test session.
     Uses DROP TABLE ... CASCADE to handle foreign key dependencies.
     """
-    # Drop all tables with CASCADE to handle foreign key dependencies
+    table_names = [table.name for table in Base.metadata.tables.values()]
+
+    # Drop and recreate in a single transaction on one connection
     with engine.begin() as conn:
-        # Get all table names from metadata
-        table_names = [table.name for table in Base.metadata.tables.values()]
-        
-        # Drop all tables with CASCADE to handle foreign key constraints
         # CASCADE will automatically drop dependent objects (foreign keys, indexes, etc.)
         for table_name in table_names:
             conn.execute(text(f'DROP TABLE IF EXISTS "{table_name}" CASCADE'))
-    
-    Base.metadata.create_all(bind=engine, checkfirst=True)
+        Base.metadata.create_all(bind=conn, checkfirst=True)
     yield
-    # Cleanup after all tests
+    # A worker database is dropped whole by _worker_database; only the shared
+    # test database needs its tables removed
+    if XDIST_WORKER:
+        return
     with engine.begin() as conn:
-        # Drop all tables with CASCADE
-        table_names = [table.name for table in Base.metadata.tables.values()]
         for table_name in table_names:
             conn.execute(text(f'DROP TABLE IF EXISTS "{table_name}" CASCADE'))
 
 
-@pytest.fixture(scope="function")
-def db_session():
+@pytest.fixture(scope="session")
+def _shared_connection(setup_test_db):
     """
-    Provide a transactional scope around a series of operations.
-    Uses savepoints to allow seed data to persist while rolling back test changes.
+    Hold a single connection and outer transaction for the whole test session.
+    Nothing written during the run is ever committed; the outer transaction is
+    rolled back once all tests have finished.
     """
-    # Create a connection and start a transaction
     connection = engine.connect()
     trans = connection.begin()
-    session = TestingSessionLocal(bind=connection)
-    
-    # Store connection for use in seed_data
-    session._test_connection = connection
-    
+    try:
+        yield connection
+    finally:
+        if trans.is_active:
+            trans.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="function")
+def db_session(_shared_connection):
+    """
+    Provide a transactional scope around a series of operations.
+    Each test runs inside a SAVEPOINT on the shared connection which is rolled
+    back at teardown, undoing any test changes.
+    The session joins with join_transaction_mode="create_savepoint", so
+    session.commit() in app or test code only releases the session's own
+    savepoint and never reaches the outer transaction.
+    """
+    connection = _shared_connection
+    savepoint = connection.begin_nested()
+    session = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+
     try:
         yield session
     finally:
-        # Close session first to avoid deassociation issues
-        try:
-            session.close()
-        except Exception:
-            pass
-        
-        # Rollback the transaction
-        # This will undo everything including seed data, but seed_data will recreate it for each test
-        try:
-            if trans.is_active:
-                trans.rollback()
-        except (AttributeError, sa_exc.InvalidRequestError):
-            # Transaction may already be rolled back
-            pass
-        except Exception:
-            pass
-        
-        # Finally close the connection
+        session.close()
         try:
-            connection.close()
-        except Exception:
+            if savepoint.is_active:
+                savepoint.rollback()
+        except (sa_exc.PendingRollbackError, sa_exc.InvalidRequestError):
+            # Savepoint may already be rolled back or deassociated
             pass
 
 
-@pytest.fixture(scope="function")
-def seed_data(db_session):
+@pytest.fixture(scope="session")
+def _seeded_connection(_shared_connection):
     """
-    Seed initial data for testing.
-    Ensures each test gets predictable users.
-    Uses savepoints so test changes can be rolled back while keeping seed data.
+    Seed initial data once per test session.
+    Rows are written inside the session-wide outer transaction, below every
+    per-test savepoint, so they survive each test's rollback.
     """
-    # Get the connection from the session
-    connection = db_session._test_connection
-    
+    session = TestingSessionLocal(bind=_shared_connection, join_transaction_mode="create_savepoint")
+    # Every seeded user shares the password "password"; hash it once
+    password_hash = get_password_hash("password")
+
     # Seeded user 1
     alice = Account(
-        account_id=uuid.UUID("123e4567-e89b-12d3-a456-426614174000"),
+        account_id=_ALICE_ID,
         username="alice",
         email="alice@test.com",
-        password_hash=get_password_hash("password"),
+        password_hash=password_hash,
         account_type="FREE"
     )
 
     # Seeded user 2
     bob = Account(
-        account_id=uuid.UUID("123e4567-e89b-12d3-a456-426614174001"),
+        account_id=_BOB_ID,
         username="bob",
         email="bob@test.com",
-        password_hash=get_password_hash("password"),
+        password_hash=password_hash,
         account_type="PAID"
     )
 
-    db_session.add_all([alice, bob])
+    # Seeded user 3: mirrors the admin row in Database/Database.sql
+    admin = Account(
+        account_id=_ADMIN_ID,
+        username="admin",
+        email="test@gmail.com",
+        password_hash=password_hash,
+        account_type="FREE"
+    )
+
+    # Dedicated users for the update_user tests
+    profile_users = [
+        Account(
+            account_id=account_id,
+            username=username,
+            email=f"{username}@test.com",
+            password_hash=password_hash,
+            account_type="FREE"
+        )
+        for username, account_id in _PROFILE_USER_IDS.items()
+    ]
+
+    session.add_all([alice, bob, admin, *profile_users])
     # Flush to make objects available
-    db_session.flush()
+    session.flush()
     
     # Create FreeAccount for alice
     free_account = FreeAccount(
@@ -181,52 +269,73 @@ def seed_data(db_session):
     )
     
     # Create PaidAccount for bob
-    now = datetime.now(timezone.utc)
     paid_account = PaidAccount(
         account_id=bob.account_id,
         storage_limit_gb=30,
         monthly_cost=10.00,
-        start_date=now,
-        renewal_date=now + timedelta(days=30),
+        start_date=_SEED_NOW,
+        renewal_date=_SEED_RENEWAL,
         status="ACTIVE"
     )
     
-    db_session.add_all([free_account, paid_account])
-    db_session.flush()
+    profile_free_accounts = [
+        FreeAccount(account_id=account_id, storage_limit_gb=2)
+        for account_id in _PROFILE_USER_IDS.values()
+    ]
     
-    # Create a savepoint after seeding
-    # Tests can commit/rollback within this savepoint
-    savepoint = connection.begin_nested()
+    session.add_all([free_account, paid_account, *profile_free_accounts])
+    # Releases the session's savepoint; the outer transaction stays open
+    session.commit()
+    session.close()
     
+    return _shared_connection
+
+
+@pytest.fixture(scope="function")
+def seed_data(_seeded_connection, db_session):
+    """
+    Session with the seeded users (alice, bob, admin and the update_user
+    test users) available.
+    Ensures each test gets predictable users; changes made by the test are
+    rolled back with the db_session savepoint while the seed rows remain.
+    """
     yield db_session
 
-    # Rollback to savepoint to undo test changes, keeping seed data
-    # Suppress warnings around rollback operation
-    with warnings.catch_warnings():
-        # Suppress the specific warning we're trying to avoid
-        warnings.simplefilter("ignore", sa_exc.SAWarning)
-        warnings.filterwarnings("ignore", category=sa_exc.SAWarning, message=".*nested transaction already deassociated.*")
-        warnings.filterwarnings("ignore", message=".*nested transaction already deassociated.*")
-        
-        try:
-            # Check if savepoint is still valid before attempting rollback
-            # Only attempt rollback if savepoint is active and connection is valid
-            if (hasattr(savepoint, 'is_active') and 
-                savepoint.is_active and 
-                not connection.closed):
-                try:
-                    # Attempt rollback - warnings suppressed by context manager
-                    savepoint.rollback()
-                except (sa_exc.PendingRollbackError, 
-                        sa_exc.InvalidRequestError, 
-                        AttributeError, 
-                        sa_exc.StatementError):
-                    # Savepoint may already be rolled back, deassociated, or connection invalid
-                    # This is expected in some cases - silently ignore
-                    pass
-        except Exception:
-            # Any other exception - ignore it
-            pass
+
+# Seeded account ids are fixed, so tests can take them without a lookup query
+@pytest.fixture(scope="session")
+def alice_id(_seeded_connection):
+    """account_id of the seeded FREE user alice."""
+    return _ALICE_ID
+
+
+@pytest.fixture(scope="session")
+def bob_id(_seeded_connection):
+    """account_id of the seeded PAID user bob."""
+    return _BOB_ID
+
+
+# Matches $N placeholders; \d+ is greedy so $10 is never mistaken for $1
+_PARAM_RX = re.compile(r'\$(\d+)(?=\D|$)')
+
+
+def _convert_params(sql: str, params: list = None) -> tuple:
+    """Convert PostgreSQL parameter syntax ($1, $2) to SQLAlchemy format (:param_1, :param_2)."""
+    if not params:
+        return sql, {}
+    sql_named = _PARAM_RX.sub(lambda m: f":param_{m.group(1)}", sql)
+    return sql_named, {f"param_{i + 1}": value for i, value in enumerate(params)}
+
+
+def _debug_query_error(method: str, error: Exception, sql: str, sql_named: str, param_dict: dict) -> None:
+    """Print query details for a failed TestMasterNodeDB call when TESTMDB_DEBUG is set."""
+    if not os.environ.get("TESTMDB_DEBUG"):
+        return
+    print(f"Error in TestMasterNodeDB.{method}(): {error}")
+    print(f"Original SQL: {sql}")
+    print(f"Converted SQL: {sql_named}")
+    print(f"Params: {param_dict}")
+    print(traceback.format_exc())
 
 
 class TestMasterNodeDB:
@@ -237,21 +346,7 @@ class TestMasterNodeDB:
     
     def select(self, sql: str, params: list = None) -> list:
         """Execute SELECT query using SQLAlchemy."""
-        from sqlalchemy import text
-        import re
-        # Convert PostgreSQL parameter syntax ($1, $2) to SQLAlchemy format (:param_1, :param_2)
-        sql_named = sql
-        param_dict = {}
-        if params:
-            # Replace in reverse order to avoid replacing $10 when looking for $1
-            for i in range(len(params) - 1, -1, -1):
-                param_num = i + 1
-                param_name = f"param_{param_num}"
-                # Match $N where N is the parameter number, ensuring it's not part of a larger number
-                # Use (?=\D|$) to match end of string or non-digit after the number
-                pattern = r'\$' + str(param_num) + r'(?=\D|$)'
-                sql_named = re.sub(pattern, f':{param_name}', sql_named)
-                param_dict[param_name] = params[i]
+        sql_named, param_dict = _convert_params(sql, params)
         
         try:
             query = text(sql_named)
@@ -261,51 +356,18 @@ class TestMasterNodeDB:
             else:
                 result = self.db.execute(query)
             
-            rows = result.fetchall()
+            mappings = result.mappings().all()
         except Exception as e:
-            # Log the error for debugging
-            import traceback
-            print(f"Error in TestMasterNodeDB.select(): {e}")
-            print(f"Original SQL: {sql}")
-            print(f"Converted SQL: {sql_named}")
-            print(f"Params: {param_dict}")
-            print(traceback.format_exc())
+            _debug_query_error("select", e, sql, sql_named, param_dict)
             raise
-        # Convert rows to dict format matching what master node returns
-        if rows:
-            columns = result.keys()
-            result_list = []
-            for row in rows:
-                row_dict = {}
-                for col, val in zip(columns, row):
-                    # Convert UUID objects to strings for consistency with master node
-                    import uuid as uuid_module
-                    if isinstance(val, uuid_module.UUID):
-                        row_dict[col] = str(val)
-                    elif val is None:
-                        row_dict[col] = None
-                    else:
-                        row_dict[col] = val
-                result_list.append(row_dict)
-            return result_list
-        return []
+        # Convert rows to dict format matching what master node returns,
+        # with UUID objects as strings for consistency with master node
+        _UUID = UUID
+        return [{col: (str(val) if type(val) is _UUID else val) for col, val in row.items()} for row in mappings]
     
     def execute(self, sql: str, params: list = None) -> dict:
         """Execute INSERT/UPDATE/DELETE query using SQLAlchemy."""
-        from sqlalchemy import text
-        import re
-        # Convert PostgreSQL parameter syntax ($1, $2) to SQLAlchemy format
-        sql_named = sql
-        param_dict = {}
-        if params:
-            # Replace in reverse order to avoid replacing $10 when looking for $1
-            for i in range(len(params) - 1, -1, -1):
-                param_num = i + 1
-                param_name = f"param_{param_num}"
-                # Match $N where N is the parameter number, ensuring it's not part of a larger number
-                pattern = r'\$' + str(param_num) + r'(?=\D|$)'
-                sql_named = re.sub(pattern, f':{param_name}', sql_named)
-                param_dict[param_name] = params[i]
+        sql_named, param_dict = _convert_params(sql, params)
         
         try:
             query = text(sql_named)
@@ -317,12 +379,7 @@ class TestMasterNodeDB:
             self.db.flush()
             return {"success": True}
         except Exception as e:
-            import traceback
-            print(f"Error in TestMasterNodeDB.execute(): {e}")
-            print(f"Original SQL: {sql}")
-            print(f"Converted SQL: {sql_named}")
-            print(f"Params: {param_dict}")
-            print(traceback.format_exc())
+            _debug_query_error("execute", e, sql, sql_named, param_dict)
             raise
     
     def get_nodes(self) -> list:
@@ -376,12 +433,38 @@ class TestMasterNodeDB:
         return {"success": True, "fragment_id": str(fragment_id)}
 
 
+@pytest.fixture(scope="session")
+def app():
+    """
+    The FastAPI application for the session. Routers and middleware are wired
+    once at import; tests that need the instance (e.g. for extra dependency
+    overrides) request this rather than importing app.main themselves.
+    """
+    return fastapi_app
+
+
+@pytest.fixture(scope="session")
+def _test_client(app):
+    """
+    One TestClient (and app startup/shutdown) shared by the whole session.
+    Per-test state lives in dependency overrides installed by `client`.
+    TestClient is already an httpx.Client over an in-process ASGI transport;
+    httpx's own ASGITransport only works with AsyncClient, and every test here
+    is synchronous.
+    """
+    with TestClient(app) as c:
+        yield c
+
+
 @pytest.fixture(scope="function")
-def client(db_session, seed_data):
+def client(app, _test_client, db_session):
     """
     FastAPI TestClient fixture for sending HTTP requests.
     Overrides the get_db dependency to use the test database session.
-    Overrides get_master_node_db to use TestMasterNodeDB for direct database access.
+    Overrides get_master_db (used by the routes) and the legacy get_master_node_db
+    to use TestMasterNodeDB for direct database access.
+    Only needs the schema; tests that use the seeded users request seed_data
+    (or alice_headers/bob_headers) themselves.
     """
     def override_get_db():
         try:
@@ -397,11 +480,35 @@ def client(db_session, seed_data):
         return test_master_db
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_master_db] = override_get_master_node_db
     app.dependency_overrides[get_master_node_db] = override_get_master_node_db
     
     try:
-        with TestClient(app) as c:
-            yield c
+        yield _test_client
     finally:
-        # Remove the overrides after the test
-        app.dependency_overrides.clear()
+        # Remove only the overrides installed here, leaving any others in place
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_master_db, None)
+        app.dependency_overrides.pop(get_master_node_db, None)
+
+
+# Tests that only need a valid token get one minted directly; /auth/login
+# itself is exercised in test_login.py
+@pytest.fixture
+def alice_headers(_seeded_connection):
+    """Authorization headers for the seeded FREE user alice."""
+    return {"Authorization": f"Bearer {mint_token(_ALICE_ID, 'alice')}"}
+
+
+@pytest.fixture
+def bob_headers(_seeded_connection):
+    """Authorization headers for the seeded PAID user bob."""
+    return {"Authorization": f"Bearer {mint_token(_BOB_ID, 'bob')}"}
+
+
+@pytest.fixture
+def profile_user_headers(_seeded_connection):
+    """Return a function giving Authorization headers for a dedicated update_user test user."""
+    def make(username: str) -> dict:
+        return {"Authorization": f"Bearer {mint_token(_PROFILE_USER_IDS[username], username)}"}
+    return make
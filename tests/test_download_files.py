@@ -0,0 +1,123 @@
+import uuid
+
+import httpx
+import pytest
+
+from app.routes import download_files
+
+
+FILE_A = "00000000-0000-0000-0000-00000000000a"
+FILE_B = "00000000-0000-0000-0000-00000000000b"
+VERSION_A = "00000000-0000-0000-0000-0000000000a2"
+VERSION_B = "00000000-0000-0000-0000-0000000000b1"
+
+
+def _file_row(file_id, version_id, name):
+    return {
+        "file_id": file_id,
+        "account_id": "123e4567-e89b-12d3-a456-426614174000",
+        "file_name": name,
+        "file_size": 1024,
+        "logical_path": f"/{name}",
+        "uploaded_at": "2024-01-01T00:00:00",
+        "version_id": version_id,
+        "erasure_id": "LOW",
+        "content_hash": "abc123",
+    }
+
+
+def _fragment_row(version_id, num_fragment):
+    return {
+        "version_id": version_id,
+        "fragment_id": str(uuid.uuid4()),
+        "segment_id": str(uuid.uuid4()),
+        "num_fragment": num_fragment,
+        "bytes": "512",
+        "content_hash": "def456",
+        "node_id": None,
+        "fragment_address": None,
+        "api_endpoint": "http://storage-node-1:3000",
+        "hostname": "storage-node-1",
+    }
+
+
+@pytest.fixture
+def batch_client(app, client, alice_id):
+    """
+    Client for GET /files/batch with the master node stubbed out.
+    The account lookup is overridden and each master /query call is answered
+    from `responses` in order; the posted bodies are collected in `calls`.
+    """
+    calls = []
+    responses = []
+
+    async def fake_post(self, url, json=None, **kwargs):
+        calls.append(json)
+        return httpx.Response(200, json=responses.pop(0), request=httpx.Request("POST", url))
+
+    mp = pytest.MonkeyPatch()
+    mp.setattr(httpx.AsyncClient, "post", fake_post)
+    app.dependency_overrides[download_files.get_current_account] = lambda: {
+        "account_id": str(alice_id),
+        "username": "alice",
+        "account_type": "FREE",
+    }
+    try:
+        yield client, calls, responses
+    finally:
+        app.dependency_overrides.pop(download_files.get_current_account, None)
+        mp.undo()
+
+
+def test_get_files_batch_returns_latest_version_fragments(batch_client):
+    """Test that each file gets only the fragments of its own (latest) version."""
+    client, calls, responses = batch_client
+    responses.append({"success": True, "data": [
+        _file_row(FILE_A, VERSION_A, "a.txt"),
+        _file_row(FILE_B, VERSION_B, "b.txt"),
+    ]})
+    responses.append({"success": True, "data": [
+        _fragment_row(VERSION_A, 0),
+        _fragment_row(VERSION_A, 1),
+        _fragment_row(VERSION_B, 0),
+    ]})
+
+    response = client.get("/files/batch", params={"ids": f"{FILE_A},{FILE_B}"})
+
+    assert response.status_code == 200
+    files = {f["file_id"]: f for f in response.json()["files"]}
+    assert set(files) == {FILE_A, FILE_B}
+    assert [f["num_fragment"] for f in files[FILE_A]["fragments"]] == [0, 1]
+    assert [f["num_fragment"] for f in files[FILE_B]["fragments"]] == [0]
+    # Fragments are looked up by the version ids the file query returned
+    assert calls[1]["params"] == [[VERSION_A, VERSION_B]]
+
+
+def test_get_files_batch_no_matching_files(batch_client):
+    """Test that unknown ids return an empty list without a fragment query."""
+    client, calls, responses = batch_client
+    responses.append({"success": True, "data": []})
+
+    response = client.get("/files/batch", params={"ids": FILE_A})
+
+    assert response.status_code == 200
+    assert response.json() == {"files": []}
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize(
+    "ids",
+    [
+        "not-a-uuid",
+        ",".join(str(uuid.UUID(int=i)) for i in range(download_files.MAX_BATCH_FILES + 1)),
+    ],
+    ids=["invalid_id", "too_many_ids"]
+)
+def test_get_files_batch_rejects_bad_ids(batch_client, ids):
+    """Test that malformed or too many ids are rejected before reaching the master node."""
+    client, calls, responses = batch_client
+
+    response = client.get("/files/batch", params={"ids": ids})
+
+    assert response.status_code == 400
+    assert calls == []
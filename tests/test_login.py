@@ -1,37 +1,45 @@
-def test_login_flow(client, seed_data):
+import pytest
+
+from app.core.security import get_password_hash, verify_password
+
+
+@pytest.mark.parametrize(
+    "username_or_email",
+    ["alice", "alice@test.com", "test@gmail.com"],
+    ids=["username", "email", "admin_email"]
+)
+def test_login_flow(client, seed_data, username_or_email):
     """
-    Test login with an existing seeded user.
+    Test login with an existing seeded user, by username or by email.
     """
-    # Seeded user from seed_data: "alice"
-    login_data = {"username_or_email": "alice", "password": "password"}
+    login_data = {"username_or_email": username_or_email, "password": "password"}
     response = client.post("/auth/login", json=login_data)
     assert response.status_code == 200
     assert "access_token" in response.json()
 
 
-def test_login_invalid_credentials(client, seed_data):
-    """
-    Test login with invalid credentials.
-    """
-    login_data = {"username_or_email": "nonexistent@example.com", "password": "wrongpassword"}
+@pytest.mark.parametrize(
+    "username_or_email,password",
+    [
+        ("nonexistent@example.com", "wrongpassword"),
+        ("alice", "wrongpassword"),
+    ],
+    ids=["invalid_credentials", "wrong_password"]
+)
+def test_login_rejected(client, seed_data, username_or_email, password):
+    """
+    Test login with an unknown user, or a known user with the wrong password.
+    """
+    login_data = {"username_or_email": username_or_email, "password": password}
     response = client.post("/auth/login", json=login_data)
     assert response.status_code == 401
 
 
-def test_login_with_email(client, seed_data):
-    """
-    Test login using email instead of username.
-    """
-    login_data = {"username_or_email": "alice@test.com", "password": "password"}
-    response = client.post("/auth/login", json=login_data)
-    assert response.status_code == 200
-    assert "access_token" in response.json()
-
-
-def test_login_wrong_password(client, seed_data):
+def test_password_hash_uses_test_cost():
     """
-    Test login with correct username but wrong password.
+    Test that hashes made during the test run use the minimum bcrypt cost,
+    so the seeded logins stay cheap to verify.
     """
-    login_data = {"username_or_email": "alice", "password": "wrongpassword"}
-    response = client.post("/auth/login", json=login_data)
-    assert response.status_code == 401
+    hashed = get_password_hash("password")
+    assert hashed.startswith("$2b$04$")
+    assert verify_password("password", hashed)
@@ -1,54 +1,55 @@
 import pytest
 
+from app.core.security import mint_token
 
-def test_get_storage_usage_free_account(client, seed_data):
-    """Test getting storage usage for a FREE account."""
-    # Login as alice (FREE account)
-    login_data = {"username_or_email": "alice", "password": "password"}
-    login_response = client.post("/auth/login", json=login_data)
-    assert login_response.status_code == 200
-    token = login_response.json()["access_token"]
-    
-    headers = {"Authorization": f"Bearer {token}"}
+# Storage tier sizes of the seeded FREE (alice) and PAID (bob) accounts
+GB = 1024 ** 3
+FREE_BYTES = 2 * GB
+PAID_BYTES = 30 * GB
+
+
+@pytest.fixture
+def seeded_account(request, alice_id, bob_id):
+    """(account_id, Authorization headers) of the seeded user named by the indirect param."""
+    account_id = {"alice": alice_id, "bob": bob_id}[request.param]
+    return str(account_id), {"Authorization": f"Bearer {mint_token(account_id, request.param)}"}
+
+
+@pytest.mark.parametrize(
+    "seeded_account,account_type,limit_bytes,monthly_cost",
+    [("alice", "FREE", FREE_BYTES, None), ("bob", "PAID", PAID_BYTES, 10.0)],
+    indirect=["seeded_account"],
+    ids=["free_account", "paid_account"]
+)
+def test_get_storage_usage(client, seed_data, seeded_account, account_type, limit_bytes, monthly_cost):
+    """Test getting storage usage for the seeded FREE (alice) and PAID (bob) accounts."""
+    account_id, headers = seeded_account
     response = client.get("/storage/usage", headers=headers)
     
     assert response.status_code == 200
     data = response.json()
     
-    assert data["account_type"] == "FREE"
-    assert data["storage_limit_gb"] == 2
-    assert data["used_bytes"] == 0  # No files uploaded yet
-    assert data["used_gb"] == 0.0
-    assert data["remaining_bytes"] == 2 * (1024 ** 3)
-    assert data["remaining_gb"] == 2.0
-    assert data["usage_percentage"] == 0.0
-    assert data["monthly_cost"] is None
-    assert data["renewal_date"] is None
-
-
-def test_get_storage_usage_paid_account(client, seed_data):
-    """Test getting storage usage for a PAID account."""
-    # Login as bob (PAID account)
-    login_data = {"username_or_email": "bob", "password": "password"}
-    login_response = client.post("/auth/login", json=login_data)
-    assert login_response.status_code == 200
-    token = login_response.json()["access_token"]
-    
-    headers = {"Authorization": f"Bearer {token}"}
-    response = client.get("/storage/usage", headers=headers)
-    
-    assert response.status_code == 200
-    data = response.json()
+    # Only PAID accounts have a renewal date; its exact value comes from the seed
+    renewal_date = data.pop("renewal_date")
+    if account_type == "PAID":
+        assert isinstance(renewal_date, str)
+    else:
+        assert renewal_date is None
     
-    assert data["account_type"] == "PAID"
-    assert data["storage_limit_gb"] == 30
-    assert data["used_bytes"] == 0  # No files uploaded yet
-    assert data["used_gb"] == 0.0
-    assert data["remaining_bytes"] == 30 * (1024 ** 3)
-    assert data["remaining_gb"] == 30.0
-    assert data["usage_percentage"] == 0.0
-    assert data["monthly_cost"] == 10.0
-    assert data["renewal_date"] is not None
+    # No files uploaded yet, so nothing is used
+    expected = {
+        "account_id": account_id,
+        "account_type": account_type,
+        "used_bytes": 0,
+        "used_gb": 0.0,
+        "storage_limit_gb": limit_bytes // GB,
+        "storage_limit_bytes": limit_bytes,
+        "remaining_bytes": limit_bytes,
+        "remaining_gb": limit_bytes / GB,
+        "usage_percentage": 0.0,
+        "monthly_cost": monthly_cost,
+    }
+    assert data == expected
 
 
 def test_get_storage_usage_requires_auth(client):
@@ -1,51 +1,38 @@
-def test_update_profile_username(client, seed_data):
+def test_update_profile_username(client, seed_data, profile_user_headers):
     """
     Test updating username with authenticated user.
     """
-    # Login as seeded user alice
-    login_data = {"username_or_email": "alice", "password": "password"}
-    login_response = client.post("/auth/login", json=login_data)
-    token = login_response.json()["access_token"]
-
-    headers = {"Authorization": f"Bearer {token}"}
+    headers = profile_user_headers("alice_profile_username")
     update_data = {"username": "alice_new"}
     response = client.put("/user/profile", json=update_data, headers=headers)
 
     assert response.status_code == 200
     data = response.json()
     assert data["username"] == "alice_new"
-    assert data["email"] == "alice@test.com"
+    assert data["email"] == "alice_profile_username@test.com"
     assert "message" in data
 
 
-def test_update_profile_email(client, seed_data):
+def test_update_profile_email(client, seed_data, profile_user_headers):
     """
     Test updating email with authenticated user.
     """
-    login_data = {"username_or_email": "alice", "password": "password"}
-    login_response = client.post("/auth/login", json=login_data)
-    token = login_response.json()["access_token"]
-
-    headers = {"Authorization": f"Bearer {token}"}
+    headers = profile_user_headers("alice_profile_email")
     update_data = {"email": "alice_new@test.com"}
     response = client.put("/user/profile", json=update_data, headers=headers)
 
     assert response.status_code == 200
     data = response.json()
     assert data["email"] == "alice_new@test.com"
-    assert data["username"] == "alice"
+    assert data["username"] == "alice_profile_email"
     assert "message" in data
 
 
-def test_update_profile_both_fields(client, seed_data):
+def test_update_profile_both_fields(client, seed_data, profile_user_headers):
     """
     Test updating both username and email with authenticated user.
     """
-    login_data = {"username_or_email": "alice", "password": "password"}
-    login_response = client.post("/auth/login", json=login_data)
-    token = login_response.json()["access_token"]
-
-    headers = {"Authorization": f"Bearer {token}"}
+    headers = profile_user_headers("alice_profile_both")
     update_data = {"username": "alice_final", "email": "alice_final@test.com"}
     response = client.put("/user/profile", json=update_data, headers=headers)
 
@@ -55,16 +42,11 @@ def test_update_profile_both_fields(client, seed_data):
     assert data["email"] == "alice_final@test.com"
 
 
-def test_update_password_success(client, seed_data):
+def test_update_password_success(client, seed_data, profile_user_headers):
     """
     Test updating password with correct old password.
     """
-    # Login as seeded user alice_final
-    login_data = {"username_or_email": "alice", "password": "password"}
-    login_response = client.post("/auth/login", json=login_data)
-    token = login_response.json()["access_token"]
-
-    headers = {"Authorization": f"Bearer {token}"}
+    headers = profile_user_headers("alice_password")
     password_data = {"old_password": "password", "new_password": "newpassword123"}
     response = client.put("/user/password", json=password_data, headers=headers)
 
@@ -74,7 +56,6 @@ def test_update_password_success(client, seed_data):
     assert "password updated" in data["message"].lower()
 
     # Verify new password works
-    login_data_new = {"username_or_email": "alice", "password": "newpassword123"}
+    login_data_new = {"username_or_email": "alice_password", "password": "newpassword123"}
     login_response_new = client.post("/auth/login", json=login_data_new)
     assert login_response_new.status_code == 200
-